@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 
@@ -9,6 +11,10 @@ class Settings(BaseSettings):
     POSTGRES_HOST: str = "db"
     POSTGRES_PORT: int = 5432
 
+    # PgBouncer (transaction pooling) in front of Postgres for app queries
+    PGBOUNCER_HOST: Optional[str] = None
+    PGBOUNCER_PORT: int = 6432
+
     # Scraper settings
     RUN_TIME: str = "12:00"
     DUMP_TIME: str = "12:00"
@@ -16,6 +22,10 @@ class Settings(BaseSettings):
     MAX_CONCURRENT_REQUESTS: int = 3
     REQUEST_DELAY: float = 1.5
     MAX_PAGES: int = 10
+    # Re-scrape known listings last scraped more than this many days ago
+    # (0 = never re-scrape a URL that is already stored)
+    REFRESH_DAYS: int = 0
+    DUMPS_DIR: str = "dumps"
 
     # AutoRia settings
     BASE_URL: str = "https://auto.ria.com"
@@ -27,4 +37,23 @@ class Settings(BaseSettings):
         extra = "ignore"
 
 
-settings = Settings()
+_settings: Optional[Settings] = None
+
+
+def get_settings() -> Settings:
+    """Return the process-wide settings, reading env / .env on first use only."""
+    global _settings
+    if _settings is None:
+        _settings = Settings()
+    return _settings
+
+
+def init_worker_settings(values: dict) -> None:
+    """
+    ProcessPoolExecutor initializer.
+
+    Rebuilds settings from the parent's already-validated values so worker
+    processes never re-read the environment or .env.
+    """
+    global _settings
+    _settings = Settings.model_construct(**values)
@@ -3,13 +3,38 @@ from datetime import datetime
 from typing import Optional
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker, AsyncAttrs
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
-from sqlalchemy import String, Integer, BigInteger, DateTime
-from app.config import settings
+from sqlalchemy import String, Integer, BigInteger, DateTime, text
+from app.config import get_settings
 
 
-DATABASE_URL = f"postgresql+asyncpg://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}@{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{settings.POSTGRES_DB}"
+settings = get_settings()
 
-engine = create_async_engine(DATABASE_URL, echo=False)
+if settings.PGBOUNCER_HOST:
+    DB_HOST, DB_PORT = settings.PGBOUNCER_HOST, settings.PGBOUNCER_PORT
+else:
+    DB_HOST, DB_PORT = settings.POSTGRES_HOST, settings.POSTGRES_PORT
+
+DATABASE_URL = f"postgresql+asyncpg://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}@{DB_HOST}:{DB_PORT}/{settings.POSTGRES_DB}"
+
+if settings.PGBOUNCER_HOST:
+    # In transaction mode consecutive transactions may run on different
+    # server connections, so don't cache prepared statements client-side.
+    # PgBouncer rejects unknown startup parameters, so JIT is turned off on
+    # the server instead (`-c jit=off` in docker-compose)
+    connect_args = {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+else:
+    # Queries are short OLTP statements, JIT compilation only adds latency
+    connect_args = {"server_settings": {"jit": "off"}}
+
+engine = create_async_engine(
+    DATABASE_URL,
+    echo=False,
+    pool_size=settings.MAX_CONCURRENT_REQUESTS,
+    max_overflow=settings.MAX_CONCURRENT_REQUESTS,
+    pool_pre_ping=True,
+    pool_recycle=1800,
+    connect_args=connect_args,
+)
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
@@ -20,7 +45,7 @@ class Base(AsyncAttrs, DeclarativeBase):
 class Car(Base):
     __tablename__ = 'cars'
 
-    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(primary_key=True)
     url: Mapped[str] = mapped_column(String, unique=True, index=True)
     title: Mapped[str] = mapped_column(String)
     price_usd: Mapped[int] = mapped_column(Integer)
@@ -31,16 +56,54 @@ class Car(Base):
     images_count: Mapped[int] = mapped_column(Integer, default=0)
     car_number: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     car_vin: Mapped[Optional[str]] = mapped_column(String, nullable=True)
-    datetime_found: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    datetime_found: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+    # Refreshed on every upsert, unlike datetime_found
+    datetime_scraped: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
 
     def __repr__(self):
         return f"<Car {self.title} - ${self.price_usd}>"
 
 
+# Car columns written by the scraper and their Postgres types, in CarData
+# field order with the timestamps last
+CAR_COLUMNS = {
+    "url": "varchar",
+    "title": "varchar",
+    "price_usd": "integer",
+    "odometer": "integer",
+    "username": "varchar",
+    "phone_number": "bigint",
+    "image_url": "varchar",
+    "images_count": "integer",
+    "car_number": "varchar",
+    "car_vin": "varchar",
+    "datetime_found": "timestamp",
+    "datetime_scraped": "timestamp",
+}
+
+
 async def init_db():
     """Create all tables in the database."""
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        # create_all leaves existing tables alone; bring older schemas in line
+        await conn.execute(text("DROP INDEX IF EXISTS ix_cars_id"))
+        await conn.execute(
+            text("CREATE INDEX IF NOT EXISTS ix_cars_datetime_found ON cars (datetime_found)")
+        )
+        await conn.execute(
+            text("ALTER TABLE cars ADD COLUMN IF NOT EXISTS datetime_scraped timestamp")
+        )
+        await conn.execute(
+            text("CREATE INDEX IF NOT EXISTS ix_cars_datetime_scraped ON cars (datetime_scraped)")
+        )
+        # Rows saved before the column existed were last scraped when found
+        await conn.execute(
+            text(
+                "UPDATE cars SET datetime_scraped = datetime_found "
+                "WHERE datetime_scraped IS NULL"
+            )
+        )
 
 
 async def get_session() -> AsyncSession:
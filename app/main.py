@@ -3,12 +3,15 @@ import logging
 import signal
 import sys
 from datetime import datetime
+from functools import lru_cache
 from zoneinfo import ZoneInfo
 
+import aiohttp
+import uvloop
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 
-from app.config import settings
+from app.config import get_settings
 UA_TIMEZONE = ZoneInfo("Europe/Kyiv")
 from app.database import init_db
 from app.scraper import run_scraper
@@ -23,6 +26,21 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Overlapping runs are skipped and missed runs (e.g. during a restart)
+# fire once within an hour instead of queueing up
+JOB_DEFAULTS = {
+    "coalesce": True,
+    "max_instances": 1,
+    "misfire_grace_time": 3600,
+}
+
+
+@lru_cache(maxsize=None)
+def daily_trigger(hhmm: str) -> CronTrigger:
+    """Daily CronTrigger at "HH:MM" UA time, built once per distinct time."""
+    hour, minute = map(int, hhmm.split(":"))
+    return CronTrigger.from_crontab(f"{minute} {hour} * * *", timezone=UA_TIMEZONE)
+
 
 class ScraperService:
     """
@@ -30,20 +48,30 @@ class ScraperService:
     
     Handles:
     - Database initialization
-    - Scheduled scraping
+    - Scheduled scraping (sharing one HTTP connection pool across runs)
     - Daily database dumps
     - Graceful shutdown
     """
 
     def __init__(self):
-        self.scheduler = AsyncIOScheduler()
-        self.running = True
+        self.scheduler = AsyncIOScheduler(job_defaults=JOB_DEFAULTS)
+        self.stop_event = asyncio.Event()
+        settings = get_settings()
+        # Reused by every scrape so keep-alive connections, TLS sessions
+        # and DNS lookups survive between scheduled runs
+        self.connector = aiohttp.TCPConnector(
+            limit=settings.MAX_CONCURRENT_REQUESTS * 4,
+            use_dns_cache=True,
+            ttl_dns_cache=600,
+            keepalive_timeout=75,
+            enable_cleanup_closed=True,
+        )
 
     async def scrape_job(self):
         """Job executed by scheduler to run the scraper."""
         logger.info("Scheduled scrape job starting...")
         try:
-            count = await run_scraper()
+            count = await run_scraper(connector=self.connector)
             logger.info(f"Scheduled scrape completed: {count} cars")
         except Exception as e:
             logger.error(f"Scheduled scrape failed: {e}")
@@ -64,15 +92,12 @@ class ScraperService:
 
     def setup_scheduler(self):
         """Configure APScheduler with scrape and dump jobs."""
-        
-        # Parse RUN_TIME (format: "HH:MM")
-        run_hour, run_minute = map(int, settings.RUN_TIME.split(":"))
-        dump_hour, dump_minute = map(int, settings.DUMP_TIME.split(":"))
-        
+        settings = get_settings()
+
         # Scraping job - runs daily at specified UA time
         self.scheduler.add_job(
             self.scrape_job,
-            CronTrigger(hour=run_hour, minute=run_minute, timezone=UA_TIMEZONE),
+            daily_trigger(settings.RUN_TIME),
             id="scrape_job",
             name="AutoRia Scraper",
             replace_existing=True,
@@ -82,7 +107,7 @@ class ScraperService:
         # Dump job - runs daily at configured UA time
         self.scheduler.add_job(
             self.dump_job,
-            CronTrigger(hour=dump_hour, minute=dump_minute, timezone=UA_TIMEZONE),
+            daily_trigger(settings.DUMP_TIME),
             id="dump_job",
             name="Database Dump",
             replace_existing=True,
@@ -92,10 +117,10 @@ class ScraperService:
         self.scheduler.start()
         logger.info("Scheduler started")
 
-    def shutdown(self, signum=None, frame=None):
-        """Graceful shutdown handler."""
+    def shutdown(self):
+        """Graceful shutdown handler (runs on the event loop)."""
         logger.info("Shutdown signal received...")
-        self.running = False
+        self.stop_event.set()
         if self.scheduler.running:
             self.scheduler.shutdown(wait=False)
         logger.info("Scheduler stopped")
@@ -109,6 +134,8 @@ class ScraperService:
         3. Start scheduler
         4. Wait for shutdown
         """
+        settings = get_settings()
+
         logger.info("=" * 60)
         logger.info("AutoRia Scraper Service Starting")
         logger.info(f"Scheduled run time: {settings.RUN_TIME} UA time (Europe/Kyiv)")
@@ -124,7 +151,7 @@ class ScraperService:
         # Run initial scrape
         logger.info("Running initial scrape...")
         try:
-            count = await run_scraper()
+            count = await run_scraper(connector=self.connector)
             logger.info(f"Initial scrape completed: {count} cars")
         except Exception as e:
             logger.error(f"Initial scrape failed: {e}")
@@ -133,14 +160,15 @@ class ScraperService:
         self.setup_scheduler()
 
         # Register signal handlers for graceful shutdown
-        signal.signal(signal.SIGINT, self.shutdown)
-        signal.signal(signal.SIGTERM, self.shutdown)
+        loop = asyncio.get_running_loop()
+        loop.add_signal_handler(signal.SIGINT, self.shutdown)
+        loop.add_signal_handler(signal.SIGTERM, self.shutdown)
 
         # Keep running until shutdown
         logger.info("Service running. Press Ctrl+C to stop.")
-        while self.running:
-            await asyncio.sleep(1)
+        await self.stop_event.wait()
 
+        await self.connector.close()
         logger.info("Service stopped")
 
 
@@ -151,4 +179,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    uvloop.run(main())
@@ -1,22 +1,157 @@
 import asyncio
 import logging
 import json
+import os
 import re
-from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from datetime import datetime, timedelta
+from html import unescape
 from typing import Optional
-from dataclasses import dataclass
+from dataclasses import astuple, dataclass
 
 import aiohttp
-from bs4 import BeautifulSoup
+import orjson
+from aiolimiter import AsyncLimiter
+from selectolax.lexbor import LexborHTMLParser
 from sqlalchemy import select
-from sqlalchemy.dialects.postgresql import insert
 
-from app.config import settings
-from app.database import async_session, Car
+from app.config import get_settings, init_worker_settings
+from app.database import async_session, engine, Car, CAR_COLUMNS
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Scraped cars are saved in batches of this size while scraping continues
+SAVE_BATCH_SIZE = 200
+# Max scraped cars waiting for the writer before producers block
+SCRAPE_QUEUE_SIZE = 500
+
+# Columns refreshed when a scraped URL already exists
+UPDATE_COLUMNS = (
+    "title",
+    "price_usd",
+    "odometer",
+    "username",
+    "phone_number",
+    "image_url",
+    "images_count",
+    "car_number",
+    "car_vin",
+    "datetime_scraped",
+)
+
+# Whole batch in one statement: every column is sent as a single array
+# parameter ($1..$N) and unnest() rebuilds the rows server-side
+UPSERT_CARS_SQL = (
+    f"INSERT INTO cars ({', '.join(CAR_COLUMNS)}) "
+    "SELECT * FROM unnest("
+    + ", ".join(f"${i}::{pg_type}[]" for i, pg_type in enumerate(CAR_COLUMNS.values(), 1))
+    + ") ON CONFLICT (url) DO UPDATE SET "
+    + ", ".join(f"{col} = EXCLUDED.{col}" for col in UPDATE_COLUMNS)
+)
+
+# Patterns used on every list / detail page and phone popup, compiled once
+_LIST_LINK_RE = re.compile(
+    r'<a\s[^>]*?class="(?:[^"]*\s)?m-link-ticket(?:\s[^"]*)?"[^>]*>'
+)
+_HREF_RE = re.compile(r'\shref="([^"]*)"')
+_TITLE_TEXT_RE = re.compile(r"Продам\s+(.+?)\s+\(")
+# Whole class tokens only, like the h1.titleL / h1.head DOM selectors
+_TITLE_RE = re.compile(
+    r'<h1[^>]*\sclass="(?:[^"]*\s)?(?:titleL|head)(?:\s[^"]*)?"[^>]*>([^<]+)</h1>'
+)
+_IMG_SRC_RE = re.compile(r'<img[^>]*\ssrc="([^"]*riastatic[^"]*)"')
+_PRICE_TEXT_RE = re.compile(r'\d+\s*\$')
+_PRICE_HTML_RE = re.compile(r'(\d[\d\s]*)\s*\$')
+# Embedded-JSON / text fields of a detail page as one alternation, so the
+# page is scanned once. Each branch has a single named group, which
+# Match.lastgroup reports back.
+_FIELD_RE = re.compile(
+    r'"price[A-Za-z]*":\s*(?P<price>\d+)'
+    r'|(?P<km>\d+)\s*тис\.?\s*км'
+    r'|(?i:"vin"\s*:\s*"(?P<vin>[A-HJ-NPR-Z0-9]{17})")'
+    r'|"plateNumber"\s*:\s*"(?P<plate>[^"]+)"'
+)
+# Seller name is searched only in a short window after one of these
+# anchors; a bare "name" key can belong to anything on the page
+_SELLER_ANCHORS = ('"sellerData"', '"ownerData"')
+_SELLER_HTML_ANCHOR = 'class="seller_info_name'
+_SELLER_WINDOW = 4000
+_SELLER_RE = re.compile(r'"name"\s*:\s*"([^"]+)"')
+_SELLER_LINK_RE = re.compile(r'<a[^>]*>\s*([^<]+?)\s*</a>')
+_PLATE_TITLE_RE = re.compile(r'\(([A-Z]{2}\d{4}[A-Z]{2})\)')
+_AUTO_ID_RE = re.compile(r"autoId\s*=\s*(\d+)")
+_HASH_RE = re.compile(r'hash\s*=\s*"([^"]+)"')
+_TEL_RE = re.compile(r"tel:\s*\(?\+?\d[\d\s\(\)-]{8,}")
+_FMT_RE = re.compile(r"\(0\d{2}\)\s*\d{3}\s*\d{2}\s*\d{2}")
+_WHITESPACE_RE = re.compile(r"\s")
+_NON_DIGIT_RE = re.compile(r"[^\d]")
+
+# Ukrainian mobile operator codes (without the leading 0) as a bitmask:
+# bit N is set when "NN" is a valid code
+_UA_MOBILE_PREFIX_MASK = 0
+for _prefix in (39, 50, 63, 66, 67, 68, 73, 91, 92, 93, 94, 95, 96, 97, 98, 99):
+    _UA_MOBILE_PREFIX_MASK |= 1 << _prefix
+del _prefix
+
+# Reused for decoding JSON objects embedded in detail pages
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _scan_detail_fields(html: str) -> dict[str, str]:
+    """
+    Collect the first value of each _FIELD_RE field in a single pass.
+
+    Price only counts when it looks like a USD amount (1000-500000).
+    Stops as soon as every field has been found.
+    """
+    fields: dict[str, str] = {}
+    for match in _FIELD_RE.finditer(html):
+        name = match.lastgroup
+        if name in fields:
+            continue
+        value = match.group(name)
+        if name == "price" and not 1000 <= int(value) <= 500000:
+            continue
+        fields[name] = value
+        if len(fields) == len(_FIELD_RE.groupindex):
+            break
+    return fields
+
+
+def _find_text(tree: LexborHTMLParser, pattern: re.Pattern) -> Optional[str]:
+    """Return the first text node in the document matching `pattern`."""
+    if tree.root is None:
+        return None
+    for node in tree.root.traverse(include_text=True):
+        if node.tag == "-text" and pattern.search(node.text_content):
+            return node.text_content
+    return None
+
+
+def _find_seller_name(html: str) -> Optional[str]:
+    """
+    Find the seller's name near its JSON / HTML block.
+
+    Only scans _SELLER_WINDOW chars after the anchor; falls back to the
+    first "name" key on the page when no anchor is present.
+    """
+    for anchor in _SELLER_ANCHORS:
+        idx = html.find(anchor)
+        if idx != -1:
+            match = _SELLER_RE.search(html, idx, idx + _SELLER_WINDOW)
+            if match:
+                return match.group(1)
+
+    idx = html.find(_SELLER_HTML_ANCHOR)
+    if idx != -1:
+        match = _SELLER_LINK_RE.search(html, idx, idx + _SELLER_WINDOW)
+        if match:
+            return unescape(match.group(1))
+
+    match = _SELLER_RE.search(html)
+    return match.group(1) if match else None
 
 
 @dataclass
@@ -34,13 +169,29 @@ class CarData:
 
 
 class AutoRiaScraper:
-    def __init__(self):
+    def __init__(self, connector: Optional[aiohttp.BaseConnector] = None):
+        settings = get_settings()
         self.base_url = settings.BASE_URL
         self.search_url = settings.SEARCH_URL
         self.max_concurrent = settings.MAX_CONCURRENT_REQUESTS
         self.delay = settings.REQUEST_DELAY
         self.max_pages = settings.MAX_PAGES
+        self.refresh_days = settings.REFRESH_DAYS
         self.semaphore = asyncio.Semaphore(self.max_concurrent)
+        # Caps request *starts* to max_concurrent per `delay` seconds; the
+        # semaphore only caps how many are in flight
+        self.rate_limiter = (
+            AsyncLimiter(self.max_concurrent, self.delay)
+            if self.delay > 0
+            else nullcontext()
+        )
+        # Shared connector (keep-alive pool, DNS cache) owned by the caller;
+        # a private one is created per run when not given
+        self.connector = connector
+        # Page parsing is CPU-bound, keep it off the event loop: run() owns
+        # a process pool for its duration; without one, parsing goes to the
+        # loop's default executor
+        self.pool: Optional[ProcessPoolExecutor] = None
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
@@ -49,9 +200,8 @@ class AutoRiaScraper:
 
     async def fetch(self, session: aiohttp.ClientSession, url: str) -> Optional[str]:
         """Fetch a page with rate limiting and error handling."""
-        async with self.semaphore:
+        async with self.semaphore, self.rate_limiter:
             try:
-                await asyncio.sleep(self.delay)
                 async with session.get(url, headers=self.headers, timeout=30) as response:
                     if response.status == 200:
                         return await response.text()
@@ -66,12 +216,11 @@ class AutoRiaScraper:
 
     async def fetch_json(self, session: aiohttp.ClientSession, url: str) -> Optional[dict]:
         """Fetch JSON data with rate limiting."""
-        async with self.semaphore:
+        async with self.semaphore, self.rate_limiter:
             try:
-                await asyncio.sleep(self.delay)
                 async with session.get(url, headers=self.headers, timeout=30) as response:
                     if response.status == 200:
-                        return await response.json()
+                        return orjson.loads(await response.read())
                     return None
             except Exception as e:
                 logger.error(f"Error fetching JSON {url}: {e}")
@@ -86,9 +235,8 @@ class AutoRiaScraper:
         headers: Optional[dict] = None,
     ) -> Optional[dict]:
         """POST JSON with rate limiting and error handling."""
-        async with self.semaphore:
+        async with self.semaphore, self.rate_limiter:
             try:
-                await asyncio.sleep(self.delay)
                 async with session.post(
                     url,
                     json=json_body,
@@ -101,7 +249,7 @@ class AutoRiaScraper:
                             f"POST {url} status={response.status} body_head={body[:200]}"
                         )
                         return None
-                    return await response.json()
+                    return orjson.loads(await response.read())
             except Exception as e:
                 logger.error(f"Error POST JSON {url}: {e}")
                 return None
@@ -112,105 +260,74 @@ class AutoRiaScraper:
         
         Returns list of URLs to individual car pages.
         """
-        soup = BeautifulSoup(html, "lxml")
-        car_urls = []
-
-        # AutoRia uses content-bar or ticket-item classes for car listings
-        listings = soup.select("section.ticket-item")
-        
-        for listing in listings:
-            link = listing.select_one("a.m-link-ticket")
-            if link and link.get("href"):
-                url = link["href"]
-                if not url.startswith("http"):
-                    url = self.base_url + url
-                car_urls.append(url)
-
+        car_urls = _parse_list_page(html, self.base_url)
         logger.info(f"Found {len(car_urls)} cars on page")
         return car_urls
 
-    def parse_detail_page(self, html: str, url: str) -> Optional[CarData]:
+    async def parse_many_list_pages(self, htmls: list[str]) -> list[list[str]]:
+        """
+        Parse a batch of search results pages in the parser process pool.
+
+        Regex scanning holds the GIL, so pages are spread over processes
+        rather than threads. Returns one URL list per page, in input order.
+        """
+        loop = asyncio.get_running_loop()
+        pages_urls = await asyncio.gather(
+            *(
+                loop.run_in_executor(self.pool, _parse_list_page, html, self.base_url)
+                for html in htmls
+            )
+        )
+        logger.info(
+            f"Found {sum(map(len, pages_urls))} cars on {len(pages_urls)} pages"
+        )
+        return pages_urls
+
+    @staticmethod
+    def parse_detail_page(html: str, url: str) -> Optional[CarData]:
         """
         Parse individual car page and extract all data.
         
         Uses a hybrid approach:
         1. Extract structured data from embedded JSON (more reliable)
         2. Fall back to HTML parsing when needed
-        """
-        soup = BeautifulSoup(html, "lxml")
 
+        The DOM is only built when the title or JSON price can't be found
+        with regexes over the raw HTML.
+        """
         try:
-            # === Title (HTML) ===
-            title = "Unknown"
-            title_elem = soup.select_one("h1.titleL, h1.head, h1[class*='title']")
-            if title_elem:
-                title = title_elem.get_text(strip=True)
-            if title == "Unknown":
-                # Try page title
-                page_title = soup.select_one("title")
-                if page_title:
-                    title_text = page_title.get_text(strip=True)
-                    # Extract car name from "AUTO.RIA – Продам Форд Фьюжн 2019..."
-                    match = re.search(r"Продам\s+(.+?)\s+\(", title_text)
-                    if match:
-                        title = match.group(1)
-
-            # === Price USD (JSON) ===
-            price_usd = 0
-            # Look for price in embedded JSON - pattern: "priceValue":13600 or similar
-            price_matches = re.findall(r'"price[A-Za-z]*":\s*(\d+)', html)
-            for price in price_matches:
-                p = int(price)
-                # USD prices are typically 1000-500000
-                if 1000 <= p <= 500000:
-                    price_usd = p
-                    break
-            
-            # Fallback: look in HTML
-            if price_usd == 0:
-                price_elem = soup.find(string=re.compile(r'\d+\s*\$'))
-                if price_elem:
-                    match = re.search(r'(\d[\d\s]*)\s*\$', price_elem)
-                    if match:
-                        price_usd = int(re.sub(r'\s', '', match.group(1)))
+            fields = _scan_detail_fields(html)
+            title_match = _TITLE_RE.search(html)
+
+            if title_match and "price" in fields:
+                # === Title / price / images (regex) ===
+                title = unescape(title_match.group(1)).strip()
+                price_usd = int(fields["price"])
+                images = _IMG_SRC_RE.findall(html)
+                image_url = unescape(images[0]) if images else None
+                images_count = len(images) if images else 1
+            else:
+                title, price_usd, image_url, images_count = AutoRiaScraper._parse_detail_dom(
+                    html, int(fields.get("price", 0))
+                )
 
             # === Odometer (HTML + text search) ===
-            odometer = 0
             # Look for "XX тис. км" pattern
-            km_match = re.search(r'(\d+)\s*тис\.?\s*км', html)
-            if km_match:
-                odometer = int(km_match.group(1)) * 1000
+            odometer = int(fields.get("km", 0)) * 1000
 
             # === Seller username (JSON) ===
-            username = "Unknown"
-            seller_match = re.search(r'"name"\s*:\s*"([^"]+)"', html)
-            if seller_match:
-                username = seller_match.group(1)
-
-            # === Main image URL (HTML) ===
-            image_url = None
-            image_elem = soup.select_one('img[src*="riastatic"]')
-            if image_elem:
-                image_url = image_elem.get("src")
-
-            # === Images count (HTML) ===
-            images = soup.select('img[src*="riastatic"]')
-            images_count = len(images) if images else 1
+            username = _find_seller_name(html) or "Unknown"
 
             # === VIN code (JSON) ===
-            car_vin = None
-            vin_match = re.search(r'"vin"\s*:\s*"([A-HJ-NPR-Z0-9]{17})"', html, re.IGNORECASE)
-            if vin_match:
-                car_vin = vin_match.group(1).upper()
+            car_vin = fields.get("vin")
+            if car_vin:
+                car_vin = car_vin.upper()
 
             # === Car number / plate (JSON) ===
-            car_number = None
-            plate_match = re.search(r'"plateNumber"\s*:\s*"([^"]+)"', html)
-            if plate_match:
-                car_number = plate_match.group(1)
+            car_number = fields.get("plate")
             # Fallback: look in title
             if not car_number:
-                plate_in_title = re.search(r'\(([A-Z]{2}\d{4}[A-Z]{2})\)', html)
+                plate_in_title = _PLATE_TITLE_RE.search(html)
                 if plate_in_title:
                     car_number = plate_in_title.group(1)
 
@@ -230,43 +347,64 @@ class AutoRiaScraper:
             logger.error(f"Error parsing {url}: {e}")
             return None
 
-    def _extract_json_object(self, text: str, start_idx: int) -> Optional[str]:
+    @staticmethod
+    def _parse_detail_dom(
+        html: str, price_usd: int
+    ) -> tuple[str, int, Optional[str], int]:
         """
-        Extract a JSON object substring starting at the first '{' at/after start_idx.
-        Uses brace counting and string awareness.
-        """
-        obj_start = text.find("{", start_idx)
-        if obj_start == -1:
-            return None
+        DOM fallback for the fields regexes couldn't answer.
 
-        depth = 0
-        in_string = False
-        escape = False
-        for i in range(obj_start, len(text)):
-            ch = text[i]
-            if in_string:
-                if escape:
-                    escape = False
-                elif ch == "\\":
-                    escape = True
-                elif ch == '"':
-                    in_string = False
-                continue
-
-            if ch == '"':
-                in_string = True
-                continue
-
-            if ch == "{":
-                depth += 1
-            elif ch == "}":
-                depth -= 1
-                if depth == 0:
-                    return text[obj_start : i + 1]
-
-        return None
+        Returns (title, price_usd, image_url, images_count).
+        """
+        tree = LexborHTMLParser(html)
+
+        # === Title (HTML) ===
+        title = "Unknown"
+        title_elem = tree.css_first("h1.titleL, h1.head, h1[class*='title']")
+        if title_elem:
+            title = title_elem.text(strip=True)
+        if title == "Unknown":
+            # Try page title
+            page_title = tree.css_first("title")
+            if page_title:
+                title_text = page_title.text(strip=True)
+                # Extract car name from "AUTO.RIA – Продам Форд Фьюжн 2019..."
+                match = _TITLE_TEXT_RE.search(title_text)
+                if match:
+                    title = match.group(1)
+
+        # === Price USD (HTML) ===
+        # JSON price is missing: look in page text
+        if price_usd == 0:
+            price_elem = _find_text(tree, _PRICE_TEXT_RE)
+            if price_elem:
+                match = _PRICE_HTML_RE.search(price_elem)
+                if match:
+                    price_usd = int(_WHITESPACE_RE.sub('', match.group(1)))
+
+        # === Main image URL + images count (HTML) ===
+        images = tree.css('img[src*="riastatic"]')
+        image_url = images[0].attributes.get("src") if images else None
+        images_count = len(images) if images else 1
+
+        return title, price_usd, image_url, images_count
+
+    @staticmethod
+    def extract_phone_data(html: str) -> tuple[Optional[str], Optional[str]]:
+        """
+        Extract the `autoId` and `hash` script variables used by the phone API.
 
-    def extract_phone_popup_payload(self, html: str) -> Optional[dict]:
+        Returns (auto_id, hash), either may be None if not found.
+        """
+        auto_id = _AUTO_ID_RE.search(html)
+        hash_match = _HASH_RE.search(html)
+        return (
+            auto_id.group(1) if auto_id else None,
+            hash_match.group(1) if hash_match else None,
+        )
+
+    @staticmethod
+    def extract_phone_popup_payload(html: str) -> Optional[dict]:
         """
         Extract the payload for the phone popup BFF endpoint.
 
@@ -284,12 +422,14 @@ class AutoRiaScraper:
         if action_idx == -1:
             return None
 
-        obj = self._extract_json_object(html, action_idx)
-        if not obj:
+        obj_start = html.find("{", action_idx)
+        if obj_start == -1:
             return None
 
         try:
-            return json.loads(obj)
+            # Decodes in place from obj_start and ignores the rest of the page
+            obj, _ = _JSON_DECODER.raw_decode(html, obj_start)
+            return obj
         except Exception as e:
             logger.error(f"Failed to parse actionData JSON: {e}")
             return None
@@ -297,7 +437,7 @@ class AutoRiaScraper:
     def _extract_phone_from_popup_response(self, data: dict) -> Optional[int]:
         """Find phone number inside the popup response JSON."""
         try:
-            raw = json.dumps(data, ensure_ascii=False)
+            raw = orjson.dumps(data).decode()
         except Exception:
             raw = str(data)
 
@@ -319,24 +459,7 @@ class AutoRiaScraper:
                 return int("38" + digits)
 
             # Sometimes the leading 0 is missing
-            if len(digits) == 9 and digits[:2] in {
-                "39",
-                "50",
-                "63",
-                "66",
-                "67",
-                "68",
-                "73",
-                "91",
-                "92",
-                "93",
-                "94",
-                "95",
-                "96",
-                "97",
-                "98",
-                "99",
-            }:
+            if len(digits) == 9 and (_UA_MOBILE_PREFIX_MASK >> int(digits[:2])) & 1:
                 return int("380" + digits)
 
             # Fallback: keep digits if they look like UA number length
@@ -346,17 +469,17 @@ class AutoRiaScraper:
             return None
 
         # Prefer tel: links (most reliable)
-        tel_match = re.search(r"tel:\s*\(?\+?\d[\d\s\(\)-]{8,}", raw)
+        tel_match = _TEL_RE.search(raw)
         if tel_match:
-            digits = re.sub(r"[^\d]", "", tel_match.group(0))
+            digits = _NON_DIGIT_RE.sub("", tel_match.group(0))
             normalized = normalize_ua_phone_digits(digits)
             if normalized:
                 return normalized
 
         # Fallback: formatted UA-like (0XX) XXX XX XX
-        fmt = re.search(r"\(0\d{2}\)\s*\d{3}\s*\d{2}\s*\d{2}", raw)
+        fmt = _FMT_RE.search(raw)
         if fmt:
-            digits = re.sub(r"[^\d]", "", fmt.group(0))
+            digits = _NON_DIGIT_RE.sub("", fmt.group(0))
             normalized = normalize_ua_phone_digits(digits)
             if normalized:
                 return normalized
@@ -400,12 +523,14 @@ class AutoRiaScraper:
         if not html:
             return None
 
-        car_data = self.parse_detail_page(html, url)
+        loop = asyncio.get_running_loop()
+        car_data, payload = await loop.run_in_executor(
+            self.pool, _parse_car_page, html, url
+        )
         if not car_data:
             return None
 
         # Try to get phone number via BFF popup endpoint
-        payload = self.extract_phone_popup_payload(html)
         if payload:
             phone = await self.fetch_phone_number_via_popup(
                 session, detail_url=url, payload=payload
@@ -414,34 +539,40 @@ class AutoRiaScraper:
 
         return car_data
 
-    async def get_car_urls_from_page(
-        self, session: aiohttp.ClientSession, page: int
-    ) -> list[str]:
-        """Fetch a single search results page and extract car URLs."""
-        url = f"{self.search_url}?page={page}"
-        html = await self.fetch(session, url)
-        if not html:
-            return []
-        return self.parse_list_page(html)
-
-    async def scrape_all(self) -> list[CarData]:
+    async def scrape_all(self) -> int:
         """
         Main scraping method - List → Detail pattern.
         
         1. Scrape search result pages to get car URLs
         2. Scrape each car page for full details
         3. Fetch phone numbers where possible
+        4. Save cars in batches of SAVE_BATCH_SIZE while scraping continues
+
+        Returns number of cars saved.
         """
         logger.info(f"Starting scrape - max {self.max_pages} pages")
-        all_cars: list[CarData] = []
 
-        async with aiohttp.ClientSession() as session:
+        async with aiohttp.ClientSession(
+            connector=self.connector,
+            connector_owner=self.connector is None,
+        ) as session:
             # Phase 1: Get all car URLs from list pages
             logger.info("Phase 1: Collecting car URLs from search pages...")
             all_urls: list[str] = []
 
-            for page in range(1, self.max_pages + 1):
-                urls = await self.get_car_urls_from_page(session, page)
+            # Fetch all list pages at once (the semaphore caps concurrency),
+            # parse them as one batch, then keep them in page order up to
+            # the first empty one
+            htmls = await asyncio.gather(
+                *(
+                    self.fetch(session, f"{self.search_url}?page={page}")
+                    for page in range(1, self.max_pages + 1)
+                )
+            )
+            pages_urls = await self.parse_many_list_pages(
+                [html or "" for html in htmls]
+            )
+            for page, urls in enumerate(pages_urls, start=1):
                 if not urls:
                     logger.info(f"No more cars found at page {page}, stopping")
                     break
@@ -450,68 +581,118 @@ class AutoRiaScraper:
 
             logger.info(f"Phase 1 complete: {len(all_urls)} car URLs collected")
 
-            # Phase 2: Scrape each car page concurrently
+            # Promoted listings repeat across pages
+            all_urls = list(dict.fromkeys(all_urls))
+            new_urls = await self.filter_new_urls(all_urls)
+            logger.info(
+                f"Skipping {len(all_urls) - len(new_urls)} already scraped cars, "
+                f"{len(new_urls)} to fetch"
+            )
+
+            # Phase 2: Scrape each car page concurrently, streaming results
+            # through a bounded queue to a single writer
             logger.info("Phase 2: Scraping individual car pages...")
-            tasks = [self.scrape_car(session, url) for url in all_urls]
-            results = await asyncio.gather(*tasks)
+            queue: asyncio.Queue[Optional[CarData]] = asyncio.Queue(
+                maxsize=SCRAPE_QUEUE_SIZE
+            )
+            scraped = 0
+
+            async def produce(url: str) -> None:
+                nonlocal scraped
+                # One bad page must not abort the run: the writer keeps
+                # saving everything the other producers queue
+                try:
+                    car = await self.scrape_car(session, url)
+                except Exception as e:
+                    logger.error(f"Error scraping {url}: {e}")
+                    return
+                if car:
+                    scraped += 1
+                    await queue.put(car)
+
+            async def consume() -> int:
+                saved = 0
+                batch: list[CarData] = []
+                while (car := await queue.get()) is not None:
+                    batch.append(car)
+                    if len(batch) >= SAVE_BATCH_SIZE:
+                        saved += await self.save_cars(batch)
+                        batch = []
+                if batch:
+                    saved += await self.save_cars(batch)
+                return saved
+
+            writer = asyncio.create_task(consume())
+            try:
+                await asyncio.gather(*(produce(url) for url in new_urls))
+            finally:
+                # Sentinel: flush the last partial batch and stop. A dead
+                # writer no longer drains the queue, so don't wait on put()
+                if not writer.done():
+                    await queue.put(None)
+                saved = await writer
+
+            logger.info(f"Phase 2 complete: {scraped} cars scraped successfully")
+
+        return saved
 
-            all_cars = [car for car in results if car is not None]
-            logger.info(f"Phase 2 complete: {len(all_cars)} cars scraped successfully")
+    async def filter_new_urls(self, urls: list[str]) -> list[str]:
+        """
+        Drop URLs that are already stored, with a single SELECT.
 
-        return all_cars
+        Listings last scraped more than REFRESH_DAYS ago are kept so they get
+        re-scraped. On database errors all URLs are returned.
+        """
+        if not urls:
+            return []
+
+        stmt = select(Car.url).where(Car.url.in_(urls))
+        if self.refresh_days:
+            cutoff = datetime.utcnow() - timedelta(days=self.refresh_days)
+            stmt = stmt.where(Car.datetime_scraped >= cutoff)
+
+        try:
+            async with async_session() as session:
+                seen = set(await session.scalars(stmt))
+        except Exception as e:
+            logger.error(f"Error checking known URLs: {e}")
+            return urls
+
+        return [url for url in urls if url not in seen]
 
     async def save_cars(self, cars: list[CarData]) -> int:
         """
         Save cars to database using upsert (insert or update on conflict).
-        
+
+        The batch is turned into one list per column and sent as a single
+        prepared statement on the raw asyncpg connection, bypassing
+        SQLAlchemy statement compilation.
+
         Returns number of cars saved.
         """
         if not cars:
             return 0
 
-        saved = 0
-        async with async_session() as session:
-            for car in cars:
-                try:
-                    # Use PostgreSQL upsert
-                    stmt = insert(Car).values(
-                        url=car.url,
-                        title=car.title,
-                        price_usd=car.price_usd,
-                        odometer=car.odometer,
-                        username=car.username,
-                        phone_number=car.phone_number,
-                        image_url=car.image_url,
-                        images_count=car.images_count,
-                        car_number=car.car_number,
-                        car_vin=car.car_vin,
-                        datetime_found=datetime.utcnow(),
-                    )
-                    
-                    # On conflict (url already exists), update the record
-                    stmt = stmt.on_conflict_do_update(
-                        index_elements=["url"],
-                        set_={
-                            "title": stmt.excluded.title,
-                            "price_usd": stmt.excluded.price_usd,
-                            "odometer": stmt.excluded.odometer,
-                            "username": stmt.excluded.username,
-                            "phone_number": stmt.excluded.phone_number,
-                            "image_url": stmt.excluded.image_url,
-                            "images_count": stmt.excluded.images_count,
-                            "car_number": stmt.excluded.car_number,
-                            "car_vin": stmt.excluded.car_vin,
-                        },
-                    )
-                    
-                    await session.execute(stmt)
-                    saved += 1
-                except Exception as e:
-                    logger.error(f"Error saving car {car.url}: {e}")
+        # ON CONFLICT can't update the same row twice in one statement,
+        # so collapse duplicate URLs (last one wins)
+        unique_cars = list({car.url: car for car in cars}.values())
+        # Rows -> columns; CarData fields are declared in CAR_COLUMNS order
+        columns = [list(column) for column in zip(*map(astuple, unique_cars))]
+        # datetime_found (kept on conflict) and datetime_scraped
+        now = [datetime.utcnow()] * len(unique_cars)
+        columns.extend((now, now))
 
-            await session.commit()
-            logger.info(f"Saved {saved} cars to database")
+        try:
+            async with engine.connect() as conn:
+                raw = await conn.get_raw_connection()
+                status = await raw.driver_connection.execute(UPSERT_CARS_SQL, *columns)
+        except Exception as e:
+            logger.error(f"Error saving cars: {e}")
+            return 0
 
+        # Command tag is "INSERT 0 <rows>"
+        saved = int(status.split()[-1])
+        logger.info(f"Saved {saved} cars to database")
         return saved
 
     async def run(self) -> int:
@@ -524,8 +705,12 @@ class AutoRiaScraper:
         logger.info("AutoRia Scraper - Starting run")
         logger.info("=" * 50)
 
-        cars = await self.scrape_all()
-        saved = await self.save_cars(cars)
+        self.pool = _make_parser_pool()
+        try:
+            saved = await self.scrape_all()
+        finally:
+            self.pool.shutdown()
+            self.pool = None
 
         logger.info("=" * 50)
         logger.info(f"Scraping complete: {saved} cars saved")
@@ -534,7 +719,49 @@ class AutoRiaScraper:
         return saved
 
 
-async def run_scraper() -> int:
+def _make_parser_pool() -> ProcessPoolExecutor:
+    """Process pool for page parsing, with settings handed to each worker."""
+    return ProcessPoolExecutor(
+        max_workers=os.cpu_count(),
+        initializer=init_worker_settings,
+        initargs=(get_settings().model_dump(),),
+    )
+
+
+def _parse_list_page(html: str, base_url: str) -> list[str]:
+    """
+    Extract car URLs from a search results page.
+
+    Module-level so it can be pickled into the parser process pool.
+    """
+    car_urls = []
+
+    # Each listing links to its page with an <a class="m-link-ticket">;
+    # a linear regex scan is enough, no DOM needed
+    for link in _LIST_LINK_RE.finditer(html):
+        href = _HREF_RE.search(link.group(0))
+        if href and href.group(1):
+            url = unescape(href.group(1))
+            if not url.startswith("http"):
+                url = base_url + url
+            car_urls.append(url)
+
+    return car_urls
+
+
+def _parse_car_page(html: str, url: str) -> tuple[Optional[CarData], Optional[dict]]:
+    """
+    Parse a detail page and its phone popup payload in one go.
+
+    Module-level so it can be pickled into the parser process pool.
+    """
+    car_data = AutoRiaScraper.parse_detail_page(html, url)
+    if not car_data:
+        return None, None
+    return car_data, AutoRiaScraper.extract_phone_popup_payload(html)
+
+
+async def run_scraper(connector: Optional[aiohttp.BaseConnector] = None) -> int:
     """Entry point for the scraper."""
-    scraper = AutoRiaScraper()
+    scraper = AutoRiaScraper(connector=connector)
     return await scraper.run()
@@ -1,7 +1,14 @@
 import asyncio
-from unittest.mock import AsyncMock, MagicMock
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
 
-from app.scraper import AutoRiaScraper, CarData
+from app.scraper import (
+    AutoRiaScraper,
+    CarData,
+    _find_seller_name,
+    _make_parser_pool,
+    _parse_car_page,
+)
 
 
 # Sample HTML for testing
@@ -40,6 +47,22 @@ SAMPLE_DETAIL_HTML = """
 </html>
 """
 
+# Detail page with an embedded JSON price: parsed by the regex fast path
+SAMPLE_DETAIL_JSON_HTML = """
+<html>
+<body>
+    <h1 class="heading">Not the car title</h1>
+    <h1 class="titleL">BMW X5 &amp; M-Pack 2019</h1>
+    <img src="https://cdn.riastatic.com/photos/auto/1.jpg?w=1&amp;h=2"/>
+    <img src="https://cdn.riastatic.com/photos/auto/2.jpg"/>
+    <img src="https://cdn.riastatic.com/photos/auto/3.jpg"/>
+    <script>
+        window.__DATA__ = {"priceUSD": 41500, "race": "120 тис. км"};
+    </script>
+</body>
+</html>
+"""
+
 
 class TestAutoRiaScraper:
     """Test suite for AutoRiaScraper."""
@@ -70,6 +93,42 @@ class TestAutoRiaScraper:
         assert car.car_number == "AA1234BB"
         assert "cdn.riastatic.com" in car.image_url
 
+    def test_parse_detail_page_json_fast_path(self):
+        """Test the regex fast path used when the page has a JSON price."""
+        url = "https://auto.ria.com/uk/auto_bmw_x5_1.html"
+        car = self.scraper.parse_detail_page(SAMPLE_DETAIL_JSON_HTML, url)
+        
+        assert car is not None
+        assert car.title == "BMW X5 & M-Pack 2019"
+        assert car.price_usd == 41500
+        assert car.odometer == 120000
+        assert car.image_url == "https://cdn.riastatic.com/photos/auto/1.jpg?w=1&h=2"
+        assert car.images_count == 3
+
+    def test_find_seller_name_anchor_order(self):
+        """sellerData wins over ownerData wherever they appear on the page."""
+        html = (
+            '{"name": "Page title"}'
+            '{"ownerData": {"name": "Owner"}}'
+            '{"sellerData": {"id": 1, "name": "Seller"}}'
+        )
+        assert _find_seller_name(html) == "Seller"
+        assert _find_seller_name(html.replace('"sellerData"', '"other"')) == "Owner"
+
+    def test_find_seller_name_html_fallback(self):
+        """Without JSON anchors the seller_info_name link text is used."""
+        html = (
+            '{"name": "Page title"}'
+            '<div class="seller_info_name"><a href="/u/1"> Олена &amp; Ко </a></div>'
+        )
+        assert _find_seller_name(html) == "Олена & Ко"
+
+    def test_find_seller_name_stays_in_window(self):
+        """A "name" far after the anchor doesn't count; first key is the last resort."""
+        html = '{"name": "First"} "sellerData": {}' + " " * 5000 + '"name": "Far"'
+        assert _find_seller_name(html) == "First"
+        assert _find_seller_name("<html></html>") is None
+
     def test_extract_phone_data(self):
         """Test extraction of phone API parameters."""
         auto_id, hash_value = self.scraper.extract_phone_data(SAMPLE_DETAIL_HTML)
@@ -77,6 +136,18 @@ class TestAutoRiaScraper:
         assert auto_id == "12345"
         assert hash_value == "abc123def456"
 
+    def test_parse_many_list_pages(self):
+        """Test batch parsing of search results pages in the process pool."""
+        empty_html = "<html><body></body></html>"
+        with _make_parser_pool() as pool:
+            self.scraper.pool = pool
+            pages = asyncio.run(
+                self.scraper.parse_many_list_pages([SAMPLE_LIST_HTML, empty_html])
+            )
+        
+        assert pages[0] == self.scraper.parse_list_page(SAMPLE_LIST_HTML)
+        assert pages[1] == []
+
     def test_parse_empty_list_page(self):
         """Test handling of empty list page."""
         empty_html = "<html><body></body></html>"
@@ -105,6 +176,41 @@ class TestAsyncOperations:
         scraper = AutoRiaScraper()
         assert scraper.base_url == "https://auto.ria.com"
 
+    def _filter_with_known(self, refresh_days: int, known: list[str]):
+        """Run filter_new_urls against a fake session; return (urls, stmt)."""
+        scraper = AutoRiaScraper()
+        scraper.refresh_days = refresh_days
+        session = MagicMock()
+        session.scalars = AsyncMock(return_value=known)
+        session_cm = MagicMock()
+        session_cm.__aenter__ = AsyncMock(return_value=session)
+        session_cm.__aexit__ = AsyncMock(return_value=False)
+        urls = ["https://a", "https://b", "https://c"]
+        with patch("app.scraper.async_session", return_value=session_cm):
+            new_urls = asyncio.run(scraper.filter_new_urls(urls))
+        return new_urls, session.scalars.call_args.args[0]
+
+    def test_filter_new_urls_skips_known(self):
+        new_urls, stmt = self._filter_with_known(0, ["https://b"])
+        
+        assert new_urls == ["https://a", "https://c"]
+        # REFRESH_DAYS=0: every stored URL counts as known, no cutoff
+        assert "datetime_scraped" not in str(stmt)
+
+    def test_filter_new_urls_refresh_cutoff(self):
+        before = datetime.utcnow()
+        new_urls, stmt = self._filter_with_known(7, ["https://b"])
+        
+        assert new_urls == ["https://a", "https://c"]
+        # Only URLs scraped within the last 7 days are treated as known
+        compiled = stmt.compile()
+        assert "cars.datetime_scraped >=" in str(compiled)
+        cutoff = next(
+            value for value in compiled.params.values() if isinstance(value, datetime)
+        )
+        week = timedelta(days=7)
+        assert before - week <= cutoff <= datetime.utcnow() - week
+
 
 def test_integration_parse_flow():
     """Integration test for the full parse flow."""
@@ -114,14 +220,12 @@ def test_integration_parse_flow():
     urls = scraper.parse_list_page(SAMPLE_LIST_HTML)
     assert len(urls) > 0
     
-    # Parse detail page
-    car = scraper.parse_detail_page(SAMPLE_DETAIL_HTML, urls[0])
+    # Parse detail page and phone popup payload in one pass
+    phone_config = '<script>{"id":"autoPhone","actionData":{"autoId":12345}}</script>'
+    car, payload = _parse_car_page(SAMPLE_DETAIL_HTML + phone_config, urls[0])
     assert car is not None
     assert car.price_usd > 0
-    
-    # Extract phone data
-    auto_id, hash_val = scraper.extract_phone_data(SAMPLE_DETAIL_HTML)
-    assert auto_id is not None
+    assert payload == {"autoId": 12345}
 
 
 if __name__ == "__main__":
@@ -0,0 +1,78 @@
+import asyncio
+
+from app import utils
+from app.utils import cleanup_old_dumps, format_phone, print_stats
+
+
+def _make_dumps(directory, names):
+    for name in names:
+        (directory / name).write_bytes(b"x")
+
+
+def test_cleanup_old_dumps_keeps_newest(tmp_path, monkeypatch):
+    """Newest dumps are kept by filename timestamp across .sql and .sql.gz."""
+    monkeypatch.setattr(utils, "DUMPS_DIR", tmp_path)
+    _make_dumps(tmp_path, [
+        "autoria_dump_20240101_120000.sql",
+        "autoria_dump_20240102_120000.sql",
+        "autoria_dump_20240103_120000.sql.gz",
+        "autoria_dump_20240104_120000.sql.gz",
+        "autoria_dump_20240105_120000.sql.gz",
+        "notes.txt",
+    ])
+
+    deleted = asyncio.run(cleanup_old_dumps(keep_count=2))
+
+    assert deleted == 3
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "autoria_dump_20240104_120000.sql.gz",
+        "autoria_dump_20240105_120000.sql.gz",
+        "notes.txt",
+    ]
+
+
+def test_cleanup_old_dumps_nothing_to_delete(tmp_path, monkeypatch):
+    monkeypatch.setattr(utils, "DUMPS_DIR", tmp_path)
+    _make_dumps(tmp_path, ["autoria_dump_20240101_120000.sql.gz"])
+
+    assert asyncio.run(cleanup_old_dumps(keep_count=7)) == 0
+    assert [p.name for p in tmp_path.iterdir()] == ["autoria_dump_20240101_120000.sql.gz"]
+
+
+def test_cleanup_old_dumps_missing_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(utils, "DUMPS_DIR", tmp_path / "missing")
+
+    assert asyncio.run(cleanup_old_dumps()) == 0
+
+
+def test_format_phone():
+    assert format_phone(380671234567) == "+38 (067) 123-45-67"
+    assert format_phone(None) == "N/A"
+    assert format_phone(0) == "N/A"
+    # Anything that isn't a 12-digit 380... number is shown as is
+    assert format_phone(3806712345678) == "3806712345678"
+    assert format_phone(671234567) == "671234567"
+
+
+def test_print_stats(capsys):
+    print_stats({
+        "total_cars": 12345,
+        "cars_with_vin": 3,
+        "cars_with_phone": 0,
+        "average_price": 15000,
+        "min_price": 100,
+        "max_price": 99999,
+    })
+
+    rule = "=" * 40
+    assert capsys.readouterr().out == (
+        f"\n{rule}\n"
+        "AutoRia Scraper Statistics\n"
+        f"{rule}\n"
+        "Total cars:      12,345\n"
+        "With VIN:        3\n"
+        "With phone:      0\n"
+        "Average price:   $15,000\n"
+        "Price range:     $100 - $99,999\n"
+        f"{rule}\n\n"
+    )
@@ -1,26 +1,93 @@
 import asyncio
+import heapq
 import logging
 import os
+import re
+import subprocess
+import sys
 from datetime import datetime
+from operator import attrgetter
 from pathlib import Path
 from typing import Optional
 
-from app.config import settings
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.database import engine, Car
 
 logger = logging.getLogger(__name__)
 
-DUMPS_DIR = Path("/dumps") if os.path.exists("/dumps") else Path("dumps")
+DUMPS_DIR = Path(get_settings().DUMPS_DIR)
+try:
+    DUMPS_DIR.mkdir(exist_ok=True)
+except OSError as e:
+    logger.warning(f"Could not create dumps directory {DUMPS_DIR}: {e}")
+
+_STATS_RULE = "=" * 40
+
+# Same aggregate as _query_stats, for the raw asyncpg connection
+STATS_SQL = (
+    "SELECT count(*), count(car_vin), count(phone_number),"
+    " avg(price_usd), min(price_usd), max(price_usd) FROM cars"
+)
+
+_PHONE_RE = re.compile(r"380(\d{2})(\d{3})(\d{2})(\d{2})")
+
+
+def _run_gzipped_dump(
+    cmd: list[str], env: dict, dump_path: Path
+) -> tuple[subprocess.CompletedProcess, int]:
+    """
+    Run `cmd | gzip -c > dump_path` (blocking).
+
+    Returns a CompletedProcess with the first non-zero return code of the
+    pipeline and the combined stderr, plus the size of the written file.
+    """
+    with open(dump_path, "wb") as out:
+        dump = subprocess.Popen(
+            cmd, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+        try:
+            gzip = subprocess.Popen(
+                ["gzip", "-c"], stdin=dump.stdout, stdout=out, stderr=subprocess.PIPE
+            )
+        except BaseException:
+            # Don't leave pg_dump running (or a zombie) behind
+            dump.kill()
+            dump.communicate()
+            raise
+        # gzip holds the read end now; closing ours lets pg_dump see SIGPIPE
+        dump.stdout.close()
+
+        dump_err = dump.stderr.read()
+        dump.wait()
+        _, gzip_err = gzip.communicate()
+
+        # Size from the open descriptor, no second path lookup
+        size = os.fstat(out.fileno()).st_size
+
+    result = subprocess.CompletedProcess(
+        cmd,
+        dump.returncode or gzip.returncode,
+        stderr=dump_err + gzip_err,
+    )
+    return result, size
 
 
 async def create_dump() -> Optional[str]:
-    DUMPS_DIR.mkdir(exist_ok=True)
+    settings = get_settings()
     
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    dump_filename = f"autoria_dump_{timestamp}.sql"
+    dump_filename = f"autoria_dump_{timestamp}.sql.gz"
     dump_path = DUMPS_DIR / dump_filename
     
-    env = os.environ.copy()
-    env["PGPASSWORD"] = settings.POSTGRES_PASSWORD
+    # pg_dump only needs the password, PATH and a locale
+    env = {
+        "PGPASSWORD": settings.POSTGRES_PASSWORD,
+        "PATH": os.environ.get("PATH", "/usr/bin:/bin"),
+        "LANG": os.environ.get("LANG", "C.UTF-8"),
+    }
     
     cmd = [
         "pg_dump",
@@ -28,7 +95,6 @@ async def create_dump() -> Optional[str]:
         "-p", str(settings.POSTGRES_PORT),
         "-U", settings.POSTGRES_USER,
         "-d", settings.POSTGRES_DB,
-        "-f", str(dump_path),
         "--no-owner",
         "--no-acl",
     ]
@@ -36,30 +102,33 @@ async def create_dump() -> Optional[str]:
     logger.info(f"Creating database dump: {dump_path}")
     
     try:
-        process = await asyncio.create_subprocess_exec(
-            *cmd,
-            env=env,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
+        # Blocking spawn on the default thread pool: no asyncio child
+        # watcher involved, works the same from any event loop.
+        # pg_dump streams straight into gzip, uncompressed SQL never hits disk.
+        result, size = await asyncio.get_running_loop().run_in_executor(
+            None, _run_gzipped_dump, cmd, env, dump_path
         )
         
-        stdout, stderr = await process.communicate()
-        
-        if process.returncode == 0:
-            # Get file size
-            size_mb = dump_path.stat().st_size / (1024 * 1024)
+        if result.returncode == 0:
+            size_mb = size / (1024 * 1024)
             logger.info(f"Dump created successfully: {dump_path} ({size_mb:.2f} MB)")
             return str(dump_path)
         else:
-            error_msg = stderr.decode() if stderr else "Unknown error"
+            error_msg = result.stderr.decode() if result.stderr else "Unknown error"
             logger.error(f"pg_dump failed: {error_msg}")
+            dump_path.unlink(missing_ok=True)
             return None
             
     except FileNotFoundError:
-        logger.error("pg_dump not found. Is postgresql-client installed?")
+        if not DUMPS_DIR.is_dir():
+            logger.error(f"Dumps directory {DUMPS_DIR} does not exist")
+            return None
+        logger.error("pg_dump or gzip not found. Is postgresql-client installed?")
+        dump_path.unlink(missing_ok=True)
         return None
     except Exception as e:
         logger.error(f"Error creating dump: {e}")
+        dump_path.unlink(missing_ok=True)
         return None
 
 
@@ -76,24 +145,29 @@ async def cleanup_old_dumps(keep_count: int = 7) -> int:
     if not DUMPS_DIR.exists():
         return 0
     
-    # Get all dump files sorted by modification time (newest first)
-    dump_files = sorted(
-        DUMPS_DIR.glob("autoria_dump_*.sql"),
-        key=lambda p: p.stat().st_mtime,
-        reverse=True,
-    )
+    # Dump filenames embed a %Y%m%d_%H%M%S timestamp, so the newest dumps
+    # are simply the largest names - no stat() calls needed. Plain .sql
+    # dumps from before compression was added are rotated out the same way
+    with os.scandir(DUMPS_DIR) as it:
+        dump_files = [
+            entry for entry in it
+            if entry.name.startswith("autoria_dump_")
+            and entry.name.endswith((".sql.gz", ".sql"))
+        ]
     
     # Keep the most recent ones, delete the rest
-    files_to_delete = dump_files[keep_count:]
+    keep = {entry.name for entry in heapq.nlargest(keep_count, dump_files, key=attrgetter("name"))}
     deleted = 0
     
-    for dump_file in files_to_delete:
+    for entry in dump_files:
+        if entry.name in keep:
+            continue
         try:
-            dump_file.unlink()
-            logger.info(f"Deleted old dump: {dump_file}")
+            os.unlink(entry.path)
+            logger.info(f"Deleted old dump: {entry.name}")
             deleted += 1
         except Exception as e:
-            logger.error(f"Error deleting {dump_file}: {e}")
+            logger.error(f"Error deleting {entry.name}: {e}")
     
     if deleted:
         logger.info(f"Cleaned up {deleted} old dumps, kept {keep_count}")
@@ -109,8 +183,9 @@ def format_phone(phone: Optional[int]) -> str:
     phone_str = str(phone)
     
     # Ukrainian format: +38 (0XX) XXX-XX-XX
-    if len(phone_str) == 12 and phone_str.startswith("380"):
-        return f"+{phone_str[:2]} ({phone_str[2:5]}) {phone_str[5:8]}-{phone_str[8:10]}-{phone_str[10:]}"
+    m = _PHONE_RE.fullmatch(phone_str)
+    if m:
+        return f"+38 (0{m[1]}) {m[2]}-{m[3]}-{m[4]}"
     
     return phone_str
 
@@ -125,54 +200,78 @@ def format_odometer(km: int) -> str:
     return f"{km:,} km"
 
 
-async def get_stats() -> dict:
+async def get_stats(session: Optional[AsyncSession] = None) -> dict:
     """
     Get scraper statistics from the database.
     
+    Runs the aggregate query straight on the asyncpg connection; the ORM
+    query is used when the caller passes in a session.
+    
+    Args:
+        session: Optional open session to reuse; a new one is opened otherwise
+        
     Returns dict with counts and summaries.
     """
-    from app.database import async_session, Car
-    from sqlalchemy import func, select
+    if session is not None:
+        return await _query_stats(session)
     
-    async with async_session() as session:
-        # Total cars
-        total = await session.scalar(select(func.count(Car.id)))
-        
-        # Cars with VIN
-        with_vin = await session.scalar(
-            select(func.count(Car.id)).where(Car.car_vin.isnot(None))
-        )
-        
-        # Cars with phone
-        with_phone = await session.scalar(
-            select(func.count(Car.id)).where(Car.phone_number.isnot(None))
+    async with engine.connect() as conn:
+        raw = await conn.get_raw_connection()
+        row = await raw.driver_connection.fetchrow(STATS_SQL)
+    return _stats_dict(*row)
+
+
+async def _query_stats(session: AsyncSession) -> dict:
+    """Run the aggregate stats query on the given session."""
+    # One round-trip: count(column) already skips NULLs
+    row = (
+        await session.execute(
+            select(
+                func.count(Car.id),
+                func.count(Car.car_vin),
+                func.count(Car.phone_number),
+                func.avg(Car.price_usd),
+                func.min(Car.price_usd),
+                func.max(Car.price_usd),
+            )
         )
-        
-        # Average price
-        avg_price = await session.scalar(select(func.avg(Car.price_usd)))
-        
-        # Price range
-        min_price = await session.scalar(select(func.min(Car.price_usd)))
-        max_price = await session.scalar(select(func.max(Car.price_usd)))
-        
-        return {
-            "total_cars": total or 0,
-            "cars_with_vin": with_vin or 0,
-            "cars_with_phone": with_phone or 0,
-            "average_price": int(avg_price) if avg_price else 0,
-            "min_price": min_price or 0,
-            "max_price": max_price or 0,
-        }
+    ).one()
+    return _stats_dict(*row)
+
+
+def _stats_dict(total, with_vin, with_phone, avg_price, min_price, max_price) -> dict:
+    """Build the stats dict from one aggregate result row."""
+    return {
+        "total_cars": total or 0,
+        "cars_with_vin": with_vin or 0,
+        "cars_with_phone": with_phone or 0,
+        "average_price": int(avg_price) if avg_price else 0,
+        "min_price": min_price or 0,
+        "max_price": max_price or 0,
+    }
 
 
 def print_stats(stats: dict) -> None:
     """Print statistics in a formatted way."""
-    print("\n" + "=" * 40)
-    print("AutoRia Scraper Statistics")
-    print("=" * 40)
-    print(f"Total cars:      {stats['total_cars']:,}")
-    print(f"With VIN:        {stats['cars_with_vin']:,}")
-    print(f"With phone:      {stats['cars_with_phone']:,}")
-    print(f"Average price:   {format_price(stats['average_price'])}")
-    print(f"Price range:     {format_price(stats['min_price'])} - {format_price(stats['max_price'])}")
-    print("=" * 40 + "\n")
+    total, with_vin, with_phone, avg_price, min_price, max_price = (
+        stats[k]
+        for k in (
+            "total_cars",
+            "cars_with_vin",
+            "cars_with_phone",
+            "average_price",
+            "min_price",
+            "max_price",
+        )
+    )
+    sys.stdout.write(
+        f"\n{_STATS_RULE}\n"
+        "AutoRia Scraper Statistics\n"
+        f"{_STATS_RULE}\n"
+        f"Total cars:      {total:,}\n"
+        f"With VIN:        {with_vin:,}\n"
+        f"With phone:      {with_phone:,}\n"
+        f"Average price:   {format_price(avg_price)}\n"
+        f"Price range:     {format_price(min_price)} - {format_price(max_price)}\n"
+        f"{_STATS_RULE}\n\n"
+    )